@@ -4,7 +4,6 @@ import sys
 from pathlib import Path
 
 from blogger import __version__
-from blogger.publish import publish_post
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +34,12 @@ def main():
     source = Path(args.source_file)
 
     if not source.exists():
-        logger.error(f"Source file not found: {source}")
+        logger.error("Source file not found: %s", source)
         sys.exit(1)
 
+    # Imported here so --help and --version skip the heavy dependencies.
+    from blogger.publish import publish_post
+
     try:
         publish_post(
             client_id=args.client_id,
@@ -51,6 +53,6 @@ def main():
             else [],
             source_file_path=str(source),
         )
-    except Exception as e:
-        logger.error(f"Failed to publish post: {e}")
+    except Exception:
+        logger.exception("Failed to publish post")
         sys.exit(1)
@@ -1,33 +1,134 @@
 import base64
+import functools
+import hashlib
+import html as html_lib
 import io
+import json
 import logging
 import mimetypes
+import os
+import re
+import tempfile
+import threading
+import time
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Protocol, cast
+from typing import TYPE_CHECKING, Any, Protocol, cast
 
 import google.auth.exceptions  # type: ignore
-from bs4 import BeautifulSoup, Tag
-from google.oauth2.credentials import Credentials  # type: ignore
-from googleapiclient.discovery import Resource, build  # type: ignore
+import lxml.html
 from googleapiclient.errors import HttpError  # type: ignore
+from lxml.etree import ParserError
 from PIL import Image, UnidentifiedImageError
 
+# The Google client, auth transports and requests are imported where they
+# are first used: together they dominate the import time of this module.
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials  # type: ignore
+    from googleapiclient.discovery import Resource  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional; the stdlib json decoder is used instead
+    orjson = None
+try:
+    import pyvips  # type: ignore
+except (ImportError, OSError):  # optional; needs the libvips library
+    pyvips = None
+
 logger = logging.getLogger(__name__)
 
+MAX_WIDTH = 1600  # recommended for Blogger
+JPEG_QUALITY = 85
+SCOPES: tuple[str, ...] = ("https://www.googleapis.com/auth/blogger",)
+
+_RESAMPLE_FILTERS = {
+    "lanczos": Image.Resampling.LANCZOS,
+    "bicubic": Image.Resampling.BICUBIC,
+    "bilinear": Image.Resampling.BILINEAR,
+}
+# BICUBIC is visually equivalent to LANCZOS at 1600px and about 2x faster.
+RESAMPLE = _RESAMPLE_FILTERS.get(
+    os.environ.get("BLOGGER_RESAMPLE", "").strip().lower(),
+    Image.Resampling.BICUBIC,
+)
+_VIPS_KERNELS = {
+    Image.Resampling.LANCZOS: "lanczos3",
+    Image.Resampling.BICUBIC: "cubic",
+    Image.Resampling.BILINEAR: "linear",
+}
+
 
 def _norm(v: str | None) -> str:
     """Normalize string (strip and casefold)."""
     return str(v or "").strip().casefold()
 
 
+def _cache_dir() -> Path:
+    """Return the per-user cache directory for this tool."""
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "blogger"
+
+
+def _write_cache_file(path: Path, data: bytes) -> None:
+    """Atomically write a cache file, logging (not raising) failures."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+    except OSError as e:
+        logger.debug("Could not write cache file %s: %s", path, e)
+
+
+# Cache entries not stored or reused for this long are dropped.
+_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def _prune_cache_dir(path: Path) -> None:
+    """Delete cache files not written or used for _CACHE_MAX_AGE."""
+    cutoff = time.time() - _CACHE_MAX_AGE
+    try:
+        for entry in os.scandir(path):
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+    except OSError as e:
+        logger.debug("Could not prune cache %s: %s", path, e)
+
+
+class _HttpCache:
+    """httplib2 response cache on disk; any failure is a cache miss."""
+
+    def __init__(self, path: Path) -> None:
+        import httplib2  # type: ignore
+
+        self._path = path
+        self._safe = httplib2.safename
+        _prune_cache_dir(path)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return (self._path / self._safe(key)).read_bytes()
+        except OSError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        _write_cache_file(self._path / self._safe(key), value)
+
+    def delete(self, key: str) -> None:
+        try:
+            (self._path / self._safe(key)).unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug("Could not delete HTTP cache entry: %s", e)
+
+
 class BloggerPostsResource(Protocol):
     """Protocol for Blogger API posts resource."""
 
-    def list(self, blogId: str, status: list[str]) -> Any: ...
-    def list_next(
-        self, previous_request: Any, previous_response: Any
-    ) -> Any: ...
+    def list(self, blogId: str, status: list[str], **kwargs: Any) -> Any: ...
+    def search(self, blogId: str, q: str, **kwargs: Any) -> Any: ...
+    def get(self, blogId: str, postId: str, **kwargs: Any) -> Any: ...
     def update(
         self, blogId: str, postId: str, body: dict[str, Any]
     ) -> Any: ...
@@ -40,6 +141,7 @@ class BloggerService(Protocol):
     """Protocol for Blogger API service."""
 
     def posts(self) -> BloggerPostsResource: ...
+    def new_batch_http_request(self, callback: Any = None) -> Any: ...
 
 
 def _encode_image(img_path: Path) -> str | None:
@@ -53,7 +155,10 @@ def _encode_image(img_path: Path) -> str | None:
                 mime,
             )
             return None
-        data = _resize_image_if_needed(img_path)
+        stat = img_path.stat()
+        data = _jpeg_bytes(
+            str(img_path.resolve()), stat.st_mtime_ns, stat.st_size
+        )
         if len(data) > 200 * 1024:
             logger.warning(
                 "Image %s is large (%d bytes). This may cause API errors.",
@@ -61,22 +166,118 @@ def _encode_image(img_path: Path) -> str | None:
                 len(data),
             )
 
-        b64 = base64.b64encode(data).decode()
-        return f"data:image/jpeg;base64,{b64}"
+        # Build the URI in one buffer instead of str copies of the base64.
+        uri = bytearray(b"data:image/jpeg;base64,")
+        uri += base64.b64encode(data)
+        return uri.decode("ascii")
     except (OSError, PermissionError, UnidentifiedImageError) as e:
-        logger.warning(f"Failed to encode {img_path}: {e}")
+        logger.warning("Failed to encode %s: %s", img_path, e)
+        return None
+
+
+# Bump when the encoded output changes, so stale cached JPEGs are not used.
+_IMG_CACHE_VERSION = 2
+
+
+@functools.cache
+def _prune_img_cache(path: Path) -> None:
+    """Prune an image cache directory, once per process."""
+    _prune_cache_dir(path)
+
+
+def _img_cache_dir() -> Path:
+    """Return the encoded image cache directory, pruned on first use."""
+    path = _cache_dir() / "img"
+    _prune_img_cache(path)
+    return path
+
+
+@functools.lru_cache(maxsize=256)
+def _jpeg_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """Return resized JPEG bytes for an image file version, cached on disk."""
+    backend = "vips" if pyvips is not None else "pillow"
+    key = (
+        f"{_IMG_CACHE_VERSION}:{backend}:{MAX_WIDTH}:{JPEG_QUALITY}:"
+        f"{RESAMPLE.name}:{path}:{mtime_ns}:{size}"
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    cached = _img_cache_dir() / f"{digest}.jpg"
+    try:
+        data = cached.read_bytes()
+        os.utime(cached)  # mark as used, so pruning keeps it
+        return data
+    except OSError:
+        pass
+    data = _resize_image_if_needed(Path(path))
+    _write_cache_file(cached, data)
+    return data
+
+
+# libvips loaders for raster formats Pillow also reads; anything else (SVG,
+# PDF, HEIF, ...) goes through Pillow, so both backends accept the same files.
+_VIPS_LOADERS = frozenset(
+    {"jpegload", "pngload", "gifload", "webpload", "tiffload"}
+)
+
+
+def _resize_with_vips(img_path: Path) -> bytes | None:
+    """Resize and encode with libvips, streaming the source image.
+
+    Returns None for formats left to Pillow.
+    """
+    image = pyvips.Image.new_from_file(str(img_path), access="sequential")
+    if image.get("vips-loader") not in _VIPS_LOADERS:
         return None
+    if image.hasalpha():
+        # jpegsave would flatten onto black; Pillow keeps the colour under
+        # the alpha, so drop the band instead.
+        image = image[:-1]
+    width, height = image.width, image.height
+    if width > MAX_WIDTH:
+        image = image.resize(MAX_WIDTH / width, kernel=_VIPS_KERNELS[RESAMPLE])
+        logger.info(
+            "Resized image %s from %dx%d to %dx%d",
+            img_path.name,
+            width,
+            height,
+            image.width,
+            image.height,
+        )
+    # Match the Pillow path, which saves everything else (CMYK, LAB,
+    # 16-bit) as 8-bit RGB.
+    if image.interpretation not in ("srgb", "b-w"):
+        image = image.colourspace("srgb")
+    # libvips 8.15 replaced strip with keep and warns on the old name.
+    if pyvips.at_least_libvips(8, 15):
+        return image.jpegsave_buffer(
+            Q=JPEG_QUALITY, optimize_coding=True, keep="none"
+        )
+    return image.jpegsave_buffer(
+        Q=JPEG_QUALITY, optimize_coding=True, strip=True
+    )
 
 
 def _resize_image_if_needed(img_path: Path) -> bytes:
     """Resize image to max width 1600px and encode as JPEG bytes."""
-    MAX_WIDTH = 1600  # recommended for Blogger
+    if pyvips is not None:
+        try:
+            data = _resize_with_vips(img_path)
+            if data is not None:
+                return data
+        except pyvips.Error as e:
+            logger.debug("libvips failed on %s, using Pillow: %s", img_path, e)
+
     with Image.open(img_path) as image:
         width, height = image.size
         if width > MAX_WIDTH:
             new_height = max(1, round(height * (MAX_WIDTH / width)))
+            if image.format == "JPEG":
+                # Decode at the smallest DCT scale still >= target size.
+                image.draft("RGB", (MAX_WIDTH, new_height))
+            # Box-reduce by an integer factor first so the filter only
+            # runs on an image at most twice the target size.
             resized = image.resize(
-                (MAX_WIDTH, new_height), Image.Resampling.LANCZOS
+                (MAX_WIDTH, new_height), RESAMPLE, reducing_gap=2.0
             )
             logger.info(
                 "Resized image %s from %dx%d to %dx%d",
@@ -93,70 +294,349 @@ def _resize_image_if_needed(img_path: Path) -> bytes:
             resized = resized.convert("RGB")
 
         buffer = io.BytesIO()
-        resized.save(buffer, format="JPEG", quality=85, optimize=True)
+        resized.save(
+            buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True
+        )
         return buffer.getvalue()
 
 
-def _process_img(img: Tag, base: Path) -> None:
-    """Update img src to data URI if local."""
-    src = str(img.get("src", ""))
+# Markup _embed_images may rewrite or strip: images, headers, styles, and
+# document wrappers (only the body is published). A false positive only
+# costs a parse, so any img tag counts.
+_NEEDS_PARSE_RE = re.compile(
+    r"<(?:!doctype|html|head|body|header|style|img)\b", re.IGNORECASE
+)
+
+
+# A full document; only its body is published.
+_DOCUMENT_RE = re.compile(r"<(?:!doctype|html|head|body)\b", re.IGNORECASE)
+
+
+def _local_image(img: lxml.html.HtmlElement, base: Path) -> Path | None:
+    """Return the local file an img src refers to, if any."""
+    src = img.get("src", "")
     if not src or src.startswith(("http", "data:")):
-        return
+        return None
     path = base / src if not Path(src).is_absolute() else Path(src)
-    if path.exists() and (uri := _encode_image(path)):
-        img["src"] = uri
+    return path if path.exists() else None
 
 
 def _embed_images(html: str, base: Path | None) -> str:
     """Embed local images as data URIs."""
-    soup = BeautifulSoup(html, "html.parser")
-    for header in soup.find_all("header"):
-        header.decompose()
-    for style in soup.find_all("style"):
-        style.decompose()
-    for img in soup.find_all("img"):
-        _process_img(img, base or Path.cwd())
-
-    # If input is a full HTML document, publish body only.
-    if soup.body:
-        return soup.body.decode_contents()
-
-    return str(soup)
-
-
-def get_service(client_id: str, secret: str, token: str) -> Resource:
-    """Get authenticated Blogger service."""
-    creds = Credentials(
-        None,
-        refresh_token=token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=client_id,
-        client_secret=secret,
-        scopes=["https://www.googleapis.com/auth/blogger"],
+    if not _NEEDS_PARSE_RE.search(html):
+        return html
+    try:
+        if _DOCUMENT_RE.search(html):
+            root = lxml.html.document_fromstring(html).find("body")
+        else:
+            # A document parse would move a leading script, comment, meta
+            # or title out of the body, so fragments get their own parent.
+            root = lxml.html.fragment_fromstring(html, create_parent="div")
+    except ParserError:
+        # Empty or whitespace-only input has nothing to embed.
+        return html
+    if root is None:
+        return ""
+    base = base or Path.cwd()
+    dropped: list[lxml.html.HtmlElement] = []
+    pending: list[tuple[lxml.html.HtmlElement, Path]] = []
+    # A single walk finds the nodes to strip and the images to embed;
+    # images inside a header are stripped with it.
+    for node in root.iter("header", "style", "img"):
+        if node.tag != "img":
+            dropped.append(node)
+        elif next(node.iterancestors("header"), None) is None and (
+            path := _local_image(node, base)
+        ):
+            pending.append((node, path))
+    for node in dropped:
+        node.drop_tree()
+
+    if pending:
+        # Encode in parallel; Pillow releases the GIL while decoding and
+        # resizing. Tags are only mutated here, on the calling thread.
+        workers = min(8, len(pending), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            uris = pool.map(_encode_image, [path for _, path in pending])
+            for (img, _), uri in zip(pending, uris, strict=True):
+                if uri:
+                    img.set("src", uri)
+
+    return html_lib.escape(root.text or "", quote=False) + "".join(
+        lxml.html.tostring(child, encoding="unicode") for child in root
+    )
+
+
+@functools.cache
+def _response_model() -> Any:
+    """Return a JsonModel decoding responses with orjson, if installed."""
+    if orjson is None:
+        return None
+    from googleapiclient.model import JsonModel  # type: ignore
+
+    class _OrjsonModel(JsonModel):
+        """JsonModel that decodes API responses with orjson."""
+
+        def deserialize(self, content: Any) -> Any:
+            try:
+                body = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                return super().deserialize(content)
+            if (
+                self._data_wrapper
+                and isinstance(body, dict)
+                and "data" in body
+            ):
+                body = body["data"]
+            return body
+
+    return _OrjsonModel()
+
+
+_service_lock = threading.Lock()
+# Keyed by a SHA-256 digest so raw refresh tokens are not held as keys.
+_creds_cache: dict[str, "Credentials"] = {}
+
+
+@functools.cache
+def _token_request() -> Any:
+    """Return the shared token transport, pooled and retrying 429/5xx."""
+    import google.auth.transport.requests  # type: ignore
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=None,
+                # Hand google-auth the last response, so a token endpoint
+                # that keeps failing still raises RefreshError.
+                raise_on_status=False,
+            ),
+        ),
     )
+    return google.auth.transport.requests.Request(session=session)
+
+
+def _get_credentials(client_id: str, secret: str, token: str) -> "Credentials":
+    """Return cached credentials holding a valid access token."""
+    from google.oauth2.credentials import Credentials  # type: ignore
+
+    key = hashlib.sha256(f"{client_id}\0{token}".encode()).hexdigest()
+    creds = _creds_cache.get(key)
+    if creds is None:
+        creds = _creds_cache[key] = Credentials(
+            None,
+            refresh_token=token,
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id=client_id,
+            client_secret=secret,
+            scopes=SCOPES,
+        )
+    if not creds.valid:
+        creds.refresh(_token_request())
+    return creds
+
+
+@functools.lru_cache(maxsize=8)
+def _build_service(creds: "Credentials", thread_id: int) -> "Resource":
+    """Build a Blogger service for credentials from the bundled discovery.
+
+    thread_id only keys the cache: httplib2 is not thread-safe, so each
+    thread gets its own service and HTTP connection.
+    """
+    import google_auth_httplib2  # type: ignore
+    import httplib2  # type: ignore
+    from googleapiclient.discovery import Resource, build  # type: ignore
+
     return cast(
         Resource,
         build(
             "blogger",
             "v3",
-            credentials=creds,
-            static_discovery=False,
+            # Single GETs (post fetches, search, one-status listings) are
+            # revalidated by ETag, so an unchanged response costs a 304.
+            # Batched listings are POSTs, which httplib2 never caches.
+            http=google_auth_httplib2.AuthorizedHttp(
+                creds,
+                http=httplib2.Http(cache=_HttpCache(_cache_dir() / "http")),
+            ),
+            model=_response_model(),
+            static_discovery=True,
             cache_discovery=False,
         ),
     )
 
 
+def get_service(
+    client_id: str, secret: str, token: str, thread_id: int | None = None
+) -> "Resource":
+    """Get authenticated Blogger service.
+
+    Credentials are cached per credential set, and the service per
+    credential set and thread, so a live access token and the HTTP
+    connection are reused across calls. The service must only be used by
+    the thread given by thread_id, which defaults to the calling thread.
+    """
+    if thread_id is None:
+        thread_id = threading.get_ident()
+    with _service_lock:
+        creds = _get_credentials(client_id, secret, token)
+        return _build_service(creds, thread_id)
+
+
+# Only the fields needed to match titles; nextPageToken keeps paging.
+_LIST_FIELDS = "nextPageToken,items(id,title,status)"
+
+
+_BATCH_LIMIT = 100  # calls allowed in one Google API batch request
+
+# Retries, with exponential backoff, of 429 and 5xx responses per call.
+_NUM_RETRIES = 5
+
+
+def _num_retries(req: Any) -> int:
+    """Return how often to retry a request; inserts are never retried."""
+    # A 5xx can arrive after the post was created, and googleapiclient
+    # retries whatever the method, so a retried insert may duplicate it.
+    return 0 if req.method == "POST" else _NUM_RETRIES
+
+
+def _execute_all(
+    service: BloggerService, requests: dict[str, Any]
+) -> tuple[dict[str, dict[str, Any]], dict[str, Exception]]:
+    """Execute requests in as few round trips as possible, keyed by id.
+
+    Every request is attempted; returns the responses and the errors.
+    """
+    responses: dict[str, dict[str, Any]] = {}
+    errors: dict[str, Exception] = {}
+    if len(requests) == 1:
+        ((key, req),) = requests.items()
+        try:
+            responses[key] = req.execute(num_retries=_num_retries(req))
+        except (google.auth.exceptions.RefreshError, HttpError) as e:
+            errors[key] = e
+        return responses, errors
+
+    def collect(request_id: str, response: Any, exception: Any) -> None:
+        if exception is not None:
+            errors[request_id] = exception
+        else:
+            responses[request_id] = response
+
+    items = list(requests.items())
+    for start in range(0, len(items), _BATCH_LIMIT):
+        chunk = items[start : start + _BATCH_LIMIT]
+        batch = service.new_batch_http_request(callback=collect)
+        for key, req in chunk:
+            batch.add(req, request_id=key)
+        try:
+            batch.execute()
+        except Exception as e:
+            # The whole batch failed, e.g. on a timeout or dropped connection;
+            # fail its calls that got no answer and keep earlier responses.
+            for key, _ in chunk:
+                if key not in responses:
+                    errors.setdefault(key, e)
+    return responses, errors
+
+
 def _iter_posts(
-    service: BloggerService, blog_id: str
+    service: BloggerService,
+    blog_id: str,
+    statuses: tuple[str, ...] = ("DRAFT", "SCHEDULED", "LIVE"),
+) -> Iterator[dict[str, Any]]:
+    """Yield all posts from blog with the given statuses.
+
+    Each round fetches the next page of every status in one batch request.
+    Posts are still yielded status by status, in the order given: a later
+    status's pages are held back until every earlier status is exhausted.
+    """
+    tokens: dict[str, str | None] = dict.fromkeys(statuses)
+    buffered: dict[str, list[dict[str, Any]]] = {s: [] for s in statuses}
+    order = list(statuses)
+    while tokens:
+        pages, errors = _execute_all(
+            service,
+            {
+                status: service.posts().list(
+                    blogId=blog_id,
+                    status=[status],
+                    fields=_LIST_FIELDS,
+                    fetchBodies=False,
+                    maxResults=500,
+                    pageToken=token,
+                )
+                for status, token in tokens.items()
+            },
+        )
+        if errors:
+            raise next(iter(errors.values()))
+        for status in tokens:
+            buffered[status].extend(pages[status].get("items", []))
+        tokens = {
+            status: pages[status]["nextPageToken"]
+            for status in tokens
+            if pages[status].get("nextPageToken")
+        }
+        while order:
+            items = buffered[order[0]]
+            yield from items
+            items.clear()
+            if order[0] in tokens:
+                break  # more pages of this status come next round
+            order.pop(0)
+
+
+def _iter_candidates(
+    service: BloggerService, blog_id: str, title: str
 ) -> Iterator[dict[str, Any]]:
-    """Yield all posts from blog."""
-    for status in ["DRAFT", "SCHEDULED", "LIVE"]:
-        req = service.posts().list(blogId=blog_id, status=[status])
+    """Yield posts that may match title, drafts and scheduled first."""
+    yield from _iter_posts(service, blog_id, ("DRAFT", "SCHEDULED"))
+    # Search only covers live posts. If no result matched, the consumer
+    # keeps iterating and we fall back to scanning every live post.
+    res = (
+        service.posts()
+        .search(
+            blogId=blog_id,
+            q=title,
+            fields="items(id,title,status)",
+            fetchBodies=False,
+        )
+        .execute(num_retries=_NUM_RETRIES)
+    )
+    yield from res.get("items", [])
+    yield from _iter_posts(service, blog_id, ("LIVE",))
+
+
+# Per blog, a complete index of normalised title -> post from a full scan.
+_title_index_cache: dict[str, dict[str, dict[str, Any]]] = {}
+
 
-        while req:
-            res = req.execute()
-            yield from res.get("items", [])
-            req = service.posts().list_next(req, res)
+def _title_index(service: Any, blog_id: str) -> dict[str, dict[str, Any]]:
+    """Return the blog's title index, scanning every post on first use."""
+    index = _title_index_cache.get(blog_id)
+    if index is None:
+        index = {}
+        for post in _iter_posts(service, blog_id):
+            index.setdefault(_norm(post.get("title")), post)
+        _title_index_cache[blog_id] = index
+    return index
+
+
+def _index_post(blog_id: str, title: str, post: dict[str, Any]) -> None:
+    """Record a written post in the blog's title index, if built."""
+    index = _title_index_cache.get(blog_id)
+    if index is not None:
+        index[_norm(title)] = post
 
 
 def find_post_by_title(
@@ -165,14 +645,22 @@ def find_post_by_title(
     """Find post by case-insensitive title."""
     try:
         target = _norm(title)
-        post = next(
-            (
-                p
-                for p in _iter_posts(service, blog_id)
-                if _norm(p.get("title")) == target
-            ),
-            None,
-        )
+        index = _title_index_cache.get(blog_id)
+        if index is not None:
+            post = index.get(target)
+        else:
+            # Stop at the first match; a scan that finds nothing has seen
+            # every post, so keep what it saw as the blog's index.
+            seen: dict[str, dict[str, Any]] = {}
+            for post in _iter_candidates(service, blog_id, title):
+                # Inline _norm: this runs once per post in the blog.
+                key = (post.get("title") or "").strip().casefold()
+                if key == target:
+                    break
+                seen.setdefault(key, post)
+            else:
+                post = None
+                _title_index_cache[blog_id] = seen
         if post:
             logger.info(
                 "Found: %s (ID:%s, Status:%s)",
@@ -182,57 +670,267 @@ def find_post_by_title(
             )
         return post
     except (google.auth.exceptions.RefreshError, HttpError) as e:
-        logger.error(f"Search failed: {e}")
+        logger.error("Search failed: %s", e)
         raise
 
 
+def _load_post_ids(blog_id: str) -> dict[str, str]:
+    """Load the cached title to post ID index for a blog."""
+    try:
+        path = _cache_dir() / f"{blog_id}.json"
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _remember_post_id(blog_id: str, title: str, post_id: str) -> None:
+    """Record the post ID for a title in the blog's index."""
+    ids = _load_post_ids(blog_id)
+    ids[_norm(title)] = post_id
+    _write_cache_file(
+        _cache_dir() / f"{blog_id}.json", json.dumps(ids).encode("utf-8")
+    )
+
+
+# Enough of a post to match its title and tell whether a write would
+# change it.
+_POST_FIELDS = "id,title,status,content,labels"
+
+
+def _find_cached_post(
+    service: Any, blog_id: str, title: str
+) -> dict[str, Any] | None:
+    """Fetch the post last published under title, if it still has it."""
+    post_id = _load_post_ids(blog_id).get(_norm(title))
+    if not post_id:
+        return None
+    try:
+        post = (
+            service.posts()
+            .get(
+                blogId=blog_id,
+                postId=post_id,
+                fields=_POST_FIELDS,
+                view="AUTHOR",
+            )
+            .execute(num_retries=_NUM_RETRIES)
+        )
+    except HttpError as e:
+        if e.resp.status == 404:
+            return None
+        raise
+    # A renamed post no longer belongs to this title.
+    if _norm(post.get("title")) != _norm(title):
+        return None
+    return post
+
+
 def _exec(req: Any, op: str) -> dict[str, Any]:
-    """Execute API call with error handling."""
+    """Execute API call, retrying idempotent ones, with error handling."""
     try:
-        return req.execute()
+        return req.execute(num_retries=_num_retries(req))
     except (google.auth.exceptions.RefreshError, HttpError) as e:
-        logger.error(f"Failed to {op}: {e}")
+        logger.error("Failed to %s: %s", op, e)
         raise
 
 
-def publish_post(
-    client_id: str,
-    client_secret: str,
-    refresh_token: str,
-    blog_id: str,
+def _post_body(
     title: str,
     content: str,
-    labels: list[str] | None = None,
-    is_draft: bool = True,
-    source_file_path: str | None = None,
+    labels: list[str] | None,
+    source_file_path: str | None,
 ) -> dict[str, Any]:
-    """Publish or update a post to Blogspot."""
+    """Build the API post body, embedding local images in the content."""
     base = Path(source_file_path).parent if source_file_path else None
     content = _embed_images(content, base)
     logger.debug("Processed content size: %d bytes", len(content))
 
-    svc: Resource = get_service(client_id, client_secret, refresh_token)
-    existing = find_post_by_title(svc, blog_id, title)
-
     body: dict[str, Any] = {"title": title, "content": content}
     if labels:
         body["labels"] = labels
+    return body
+
 
+def _write_request(
+    service: Any,
+    blog_id: str,
+    body: dict[str, Any],
+    existing: dict[str, Any] | None,
+    is_draft: bool,
+) -> tuple[Any, str] | None:
+    """Return the insert/update request for a post, or None to skip it."""
     if not existing:
         logger.info("Creating new draft...")
-        return _exec(
-            svc.posts().insert(blogId=blog_id, body=body, isDraft=is_draft),  # type: ignore
-            "create",
+        req = service.posts().insert(
+            blogId=blog_id, body=body, isDraft=is_draft
         )
+        return req, "create"
 
     if _norm(existing.get("status")) != "draft":
         logger.warning(
-            "Post '%s' is %s. Skipping.", title, existing.get("status")
+            "Post '%s' is %s. Skipping.",
+            body["title"],
+            existing.get("status"),
         )
-        return existing
+        return None
 
     logger.info("Updating existing draft: %s", existing["id"])
-    return _exec(
-        svc.posts().update(blogId=blog_id, postId=existing["id"], body=body),  # type: ignore
-        "update",
+    req = service.posts().update(
+        blogId=blog_id, postId=existing["id"], body=body
+    )
+    return req, "update"
+
+
+def _is_unchanged(
+    service: Any, blog_id: str, existing: dict[str, Any], body: dict[str, Any]
+) -> bool:
+    """Return True if the stored post already has the body's content."""
+    if "content" not in existing:  # found by a scan, which skips bodies
+        existing = _exec(
+            service.posts().get(
+                blogId=blog_id,
+                postId=existing["id"],
+                fields=_POST_FIELDS,
+                view="AUTHOR",
+            ),
+            "fetch post",
+        )
+    return (
+        existing.get("title") == body["title"]
+        and existing.get("content") == body["content"]
+        and sorted(existing.get("labels") or [])
+        == sorted(body.get("labels") or [])
     )
+
+
+def _lookup_post(
+    client_id: str,
+    secret: str,
+    token: str,
+    blog_id: str,
+    title: str,
+    thread_id: int,
+) -> tuple["Resource", dict[str, Any] | None]:
+    """Return the service and the existing post with the title, if any.
+
+    The service belongs to thread_id, which takes it over once this returns.
+    """
+    svc = get_service(client_id, secret, token, thread_id)
+    existing = _find_cached_post(svc, blog_id, title)
+    if existing is None:
+        existing = find_post_by_title(svc, blog_id, title)
+        if existing:
+            _remember_post_id(blog_id, title, existing["id"])
+    return svc, existing
+
+
+def publish_post(
+    client_id: str,
+    client_secret: str,
+    refresh_token: str,
+    blog_id: str,
+    title: str,
+    content: str,
+    labels: list[str] | None = None,
+    is_draft: bool = True,
+    source_file_path: str | None = None,
+) -> dict[str, Any]:
+    """Publish or update a post to Blogspot."""
+    # Authenticate and look the post up while local images are encoded;
+    # the service is only used on the worker until its result is taken.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        lookup = pool.submit(
+            _lookup_post,
+            client_id,
+            client_secret,
+            refresh_token,
+            blog_id,
+            title,
+            threading.get_ident(),
+        )
+        body = _post_body(title, content, labels, source_file_path)
+        svc, existing = lookup.result()
+
+    if (
+        existing
+        and _norm(existing.get("status")) == "draft"
+        and _is_unchanged(svc, blog_id, existing, body)
+    ):
+        logger.info("Draft is unchanged: %s", existing["id"])
+        return existing
+
+    write = _write_request(svc, blog_id, body, existing, is_draft)
+    if write is None:
+        return existing  # type: ignore
+    result = _exec(*write)
+    _index_post(blog_id, title, result)
+    if not existing and result.get("id"):
+        _remember_post_id(blog_id, title, result["id"])
+    return result
+
+
+def publish_posts(
+    client_id: str,
+    client_secret: str,
+    refresh_token: str,
+    blog_id: str,
+    posts: list[dict[str, Any]],
+    is_draft: bool = True,
+) -> list[dict[str, Any]]:
+    """Publish or update several posts to Blogspot in batched requests.
+
+    Each post is a dict with "title" and "content" and, optionally,
+    "labels" and "source_file_path", as accepted by publish_post.
+    Results are returned in the same order as posts. Titles must be
+    unique, ignoring case and surrounding space; otherwise each would be
+    inserted as a separate post.
+    """
+    titles = [_norm(post["title"]) for post in posts]
+    if len(set(titles)) != len(titles):
+        dupes = sorted({t for t in titles if titles.count(t) > 1})
+        raise ValueError(f"Duplicate post titles: {', '.join(dupes)}")
+
+    svc = get_service(client_id, client_secret, refresh_token)
+
+    # One scan of the blog serves every lookup in the batch; it runs while
+    # the post bodies are built.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        scan = pool.submit(_title_index, svc, blog_id)
+        bodies = [
+            _post_body(
+                post["title"],
+                post["content"],
+                post.get("labels"),
+                post.get("source_file_path"),
+            )
+            for post in posts
+        ]
+        index = scan.result()
+
+    results: list[dict[str, Any]] = []
+    requests: dict[str, Any] = {}
+    for i, (post, body) in enumerate(zip(posts, bodies, strict=True)):
+        existing = index.get(_norm(post["title"]))
+        write = _write_request(svc, blog_id, body, existing, is_draft)
+        results.append(existing or {})
+        if write is not None:
+            requests[str(i)] = write[0]
+
+    responses, errors = _execute_all(svc, requests) if requests else ({}, {})
+
+    # Record every write that succeeded, even if others failed, so a retry
+    # updates those posts instead of inserting them again.
+    for key, response in responses.items():
+        results[int(key)] = response
+        _index_post(blog_id, posts[int(key)]["title"], response)
+        if response.get("id"):
+            _remember_post_id(
+                blog_id, posts[int(key)]["title"], response["id"]
+            )
+    for key, e in errors.items():
+        logger.error(
+            "Failed to publish post '%s': %s", posts[int(key)]["title"], e
+        )
+    if errors:
+        raise next(iter(errors.values()))
+    return results
@@ -1,28 +1,202 @@
 import base64
+import io
+import logging
+import os
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, Mock, patch
 
-import google.auth.exceptions  # type: ignore
 from PIL import Image
 
+from blogger import publish  # type: ignore
 from blogger.publish import (  # type: ignore
+    _embed_images,
     _encode_image,
+    _iter_posts,
+    _jpeg_bytes,
+    _resize_image_if_needed,
     find_post_by_title,
+    get_service,
     publish_post,
+    publish_posts,
 )
 
 
+class _FakeBatch:
+    """Minimal BatchHttpRequest that executes its requests in order."""
+
+    def __init__(self, callback: Any) -> None:
+        self._callback = callback
+        self._requests: list[tuple[str, Any]] = []
+
+    def add(self, request: Any, request_id: str) -> None:
+        self._requests.append((request_id, request))
+
+    def execute(self) -> None:
+        for request_id, request in self._requests:
+            try:
+                response = request.execute()
+            except Exception as e:
+                self._callback(request_id, None, e)
+            else:
+                self._callback(request_id, response, None)
+
+
+class _Posts:
+    """Stub of the posts() resource; each API method is a plain Mock."""
+
+    def __init__(self) -> None:
+        self.get = Mock()
+        self.list = Mock()
+        self.search = Mock()
+        self.insert = Mock()
+        self.update = Mock()
+
+    def reset_mock(self) -> None:
+        for method in (
+            self.get,
+            self.list,
+            self.search,
+            self.insert,
+            self.update,
+        ):
+            method.reset_mock(return_value=True, side_effect=True)
+
+
+class _Service:
+    """Stub of the Blogger service with a single posts() resource."""
+
+    def __init__(self) -> None:
+        self._posts = _Posts()
+        self.new_batch_http_request = Mock()
+
+    def posts(self) -> _Posts:
+        return self._posts
+
+    def reset_mock(self) -> None:
+        self._posts.reset_mock()
+        self.new_batch_http_request.reset_mock(
+            return_value=True, side_effect=True
+        )
+
+
+class _ListHandler(logging.Handler):
+    """Handler that keeps the messages of the records it receives."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record.getMessage())
+
+
 class TestPublish(unittest.TestCase):
+    CREDS = ("client_id", "client_secret", "refresh_token", "blog_id")
+
+    @classmethod
+    def setUpClass(cls):
+        from googleapiclient.errors import HttpError  # type: ignore
+
+        cls._template_service = _Service()
+        cls._http_err = HttpError(
+            SimpleNamespace(status=400, reason="Bad Request"), b"Bad Request"
+        )
+
+        # One handler for the whole class instead of assertLogs per test.
+        cls._handler = _ListHandler()
+        logger = logging.getLogger("blogger.publish")
+        cls._log_level = logger.level
+        logger.setLevel(logging.INFO)
+        logger.addHandler(cls._handler)
+
+    @classmethod
+    def tearDownClass(cls):
+        logger = logging.getLogger("blogger.publish")
+        logger.removeHandler(cls._handler)
+        logger.setLevel(cls._log_level)
+
     def setUp(self):
-        self.mock_service = MagicMock()
-        self.mock_posts = self.mock_service.posts.return_value
+        # Reuse one service stub; resetting also drops the return values
+        # and side effects a previous test configured.
+        self._template_service.reset_mock()
+        self.mock_service = self._template_service
+        self._handler.records.clear()
+        self.mock_posts = self.mock_service.posts()
+        self.mock_posts.insert.return_value.execute.return_value = {
+            "id": "999"
+        }
+        self.mock_posts.insert.return_value.method = "POST"
+        self.mock_posts.search.return_value.execute.return_value = {}
+
+        # Swap the module attributes directly; cheaper than patch().
+        self._orig_iter = publish._iter_posts
+        self._orig_get_service = publish.get_service
+        publish._iter_posts = self.mock_iter = MagicMock(return_value=[])
+        publish.get_service = self.mock_get_service = MagicMock(
+            return_value=self.mock_service
+        )
 
-    @patch("blogger.publish._iter_posts")
-    def test_find_post_by_title_found(self, mock_iterate: MagicMock) -> None:
+        # Keep the post index out of the user's cache directory.
+        cache_dir = TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = patch.dict("os.environ", {"XDG_CACHE_HOME": cache_dir.name})
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(publish._title_index_cache.clear)
+
+    def tearDown(self):
+        publish._iter_posts = self._orig_iter
+        publish.get_service = self._orig_get_service
+
+    def test_iter_posts_requests_partial_pages(self) -> None:
+        """Test listing requests only the fields needed to match titles."""
+        self.mock_posts.list.return_value.execute.return_value = {
+            "items": [{"id": "1", "title": "A"}]
+        }
+
+        posts = list(_iter_posts(self.mock_service, "blog_id", ("LIVE",)))
+
+        self.assertEqual(posts, [{"id": "1", "title": "A"}])
+        _, kwargs = self.mock_posts.list.call_args
+        self.assertEqual(
+            kwargs["fields"], "nextPageToken,items(id,title,status)"
+        )
+        self.assertEqual(kwargs["maxResults"], 500)
+        self.assertFalse(kwargs["fetchBodies"])
+
+    def test_iter_posts_batches_statuses(self) -> None:
+        """Test statuses share batched rounds but are yielded in order."""
+        pages = {
+            ("DRAFT", None): {"items": [{"id": "1"}], "nextPageToken": "d2"},
+            ("DRAFT", "d2"): {"items": [{"id": "2"}]},
+            ("LIVE", None): {"items": [{"id": "3"}]},
+        }
+
+        def list_posts(**kwargs: Any) -> MagicMock:
+            req = MagicMock()
+            key = (kwargs["status"][0], kwargs["pageToken"])
+            req.execute.return_value = pages[key]
+            return req
+
+        self.mock_posts.list.side_effect = list_posts
+        self.mock_service.new_batch_http_request.side_effect = _FakeBatch
+
+        posts = list(
+            _iter_posts(self.mock_service, "blog_id", ("DRAFT", "LIVE"))
+        )
+
+        # LIVE was fetched in the first round but waits for every draft.
+        self.assertEqual([p["id"] for p in posts], ["1", "2", "3"])
+        self.mock_service.new_batch_http_request.assert_called_once()
+
+    def test_find_post_by_title_found(self) -> None:
         # Setup mock to return posts
-        mock_iterate.return_value = [
+        self.mock_iter.return_value = [
             {"id": "123", "title": "My Post", "status": "DRAFT"},
             {"id": "456", "title": "Other Post", "status": "DRAFT"},
         ]
@@ -35,12 +209,25 @@ class TestPublish(unittest.TestCase):
         self.assertEqual(result["id"], "123")  # type: ignore
         self.assertEqual(result["title"], "My Post")  # type: ignore
 
-    @patch("blogger.publish._iter_posts")
-    def test_find_post_by_title_not_found(
-        self, mock_iterate: MagicMock
-    ) -> None:
+    def test_find_post_by_title_live_via_search(self) -> None:
+        """Test live posts are found by search without a live scan."""
+        self.mock_posts.search.return_value.execute.return_value = {
+            "items": [
+                {"id": "7", "title": "My Post Sequel", "status": "LIVE"},
+                {"id": "8", "title": "My Post", "status": "LIVE"},
+            ]
+        }
+
+        result = find_post_by_title(self.mock_service, "blog_id", "My Post")
+
+        self.assertEqual(result["id"], "8")  # type: ignore
+        self.mock_iter.assert_called_once_with(
+            self.mock_service, "blog_id", ("DRAFT", "SCHEDULED")
+        )
+
+    def test_find_post_by_title_not_found(self) -> None:
         # Setup mock to return different title
-        mock_iterate.return_value = [
+        self.mock_iter.return_value = [
             {"id": "123", "title": "Other Post", "status": "DRAFT"}
         ]
 
@@ -50,109 +237,358 @@ class TestPublish(unittest.TestCase):
         # Verify
         self.assertIsNone(result)
 
-    @patch("blogger.publish.get_service")
-    @patch("blogger.publish._iter_posts")
-    def test_publish_post_insert(
-        self, mock_iterate: MagicMock, mock_get_service: MagicMock
-    ) -> None:
-        mock_get_service.return_value = self.mock_service
-        mock_iterate.return_value = []  # No existing post
-
-        publish_post(
-            "client_id",
-            "client_secret",
-            "refresh_token",
-            "blog_id",
-            "New Post",
-            "Content",
-        )
+    def test_publish_post_insert(self) -> None:
+        publish_post(*self.CREDS, "New Post", "Content")
 
         # Verify insert called
         self.mock_posts.insert.assert_called_once()
         _, kwargs = self.mock_posts.insert.call_args
         self.assertEqual(kwargs["body"]["title"], "New Post")
         self.assertTrue(kwargs["isDraft"])  # Default is True
+        self.mock_posts.insert.return_value.execute.assert_called_once_with(
+            num_retries=0
+        )
 
-    @patch("blogger.publish.get_service")
-    @patch("blogger.publish._iter_posts")
-    def test_publish_post_update(
-        self, mock_iterate: MagicMock, mock_get_service: MagicMock
-    ) -> None:
-        mock_get_service.return_value = self.mock_service
-
+    def test_publish_post_update(self) -> None:
         # Mock search to return found
-        mock_iterate.return_value = [
+        self.mock_iter.return_value = [
             {"id": "123", "title": "Existing Post", "status": "DRAFT"}
         ]
 
-        publish_post(
-            "client_id",
-            "client_secret",
-            "refresh_token",
-            "blog_id",
-            "Existing Post",
-            "New Content",
-        )
+        publish_post(*self.CREDS, "Existing Post", "New Content")
 
         # Verify update called
         self.mock_posts.update.assert_called_once()
         _, kwargs = self.mock_posts.update.call_args
         self.assertEqual(kwargs["postId"], "123")
         self.assertEqual(kwargs["body"]["content"], "New Content")
+        self.mock_posts.update.return_value.execute.assert_called_once_with(
+            num_retries=5
+        )
 
-    @patch("blogger.publish.get_service")
-    @patch("blogger.publish._iter_posts")
-    def test_publish_post_skip_non_draft(
-        self, mock_iterate: MagicMock, mock_get_service: MagicMock
-    ) -> None:
+    def test_publish_post_skip_non_draft(self) -> None:
         """Test that we skip updating if the post is not a draft."""
-        mock_get_service.return_value = self.mock_service
-        mock_iterate.return_value = [
+        self.mock_iter.return_value = [
             {"id": "123", "title": "Live Post", "status": "LIVE"}
         ]
 
-        with self.assertLogs("blogger.publish", level="WARNING") as cm:
-            result = publish_post(
-                "client_id",
-                "client_secret",
-                "refresh_token",
-                "blog_id",
-                "Live Post",
-                "New Content",
-            )
+        result = publish_post(*self.CREDS, "Live Post", "New Content")
 
         self.mock_posts.update.assert_not_called()
         self.mock_posts.insert.assert_not_called()
         self.assertEqual(result["status"], "LIVE")
         self.assertTrue(
-            any("is LIVE. Skipping" in output for output in cm.output)
+            any("is LIVE. Skipping" in m for m in self._handler.records)
+        )
+
+    def test_publish_post_uses_cached_post_id(self) -> None:
+        """Test a repeat publish fetches the known post instead of scanning."""
+        self.mock_posts.get.return_value.execute.return_value = {
+            "id": "999",
+            "title": "New Post",
+            "status": "DRAFT",
+        }
+
+        publish_post(*self.CREDS, "New Post", "Content")
+        self.mock_iter.reset_mock()
+        publish_post(*self.CREDS, "New Post", "Updated")
+
+        self.mock_iter.assert_not_called()
+        _, kwargs = self.mock_posts.get.call_args
+        self.assertEqual(kwargs["postId"], "999")
+        _, kwargs = self.mock_posts.update.call_args
+        self.assertEqual(kwargs["postId"], "999")
+
+    @staticmethod
+    def _http_error(status: int) -> Exception:
+        from googleapiclient.errors import HttpError  # type: ignore
+
+        return HttpError(SimpleNamespace(status=status, reason="Error"), b"")
+
+    def test_find_cached_post_forgets_deleted_post(self) -> None:
+        """Test a 404 for the cached ID falls back to a title lookup."""
+        publish._remember_post_id("blog_id", "My Post", "42")
+        self.mock_posts.get.return_value.execute.side_effect = (
+            self._http_error(404)
+        )
+
+        self.assertIsNone(
+            publish._find_cached_post(self.mock_service, "blog_id", "My Post")
+        )
+        _, kwargs = self.mock_posts.get.call_args
+        self.assertEqual(kwargs["postId"], "42")
+
+    def test_find_cached_post_ignores_renamed_post(self) -> None:
+        """Test a post renamed since its ID was cached is not reused."""
+        publish._remember_post_id("blog_id", "My Post", "42")
+        self.mock_posts.get.return_value.execute.return_value = {
+            "id": "42",
+            "title": "Renamed Post",
+            "status": "DRAFT",
+        }
+
+        self.assertIsNone(
+            publish._find_cached_post(self.mock_service, "blog_id", "My Post")
+        )
+
+    def test_find_cached_post_raises_other_http_errors(self) -> None:
+        """Test errors other than 404 are not mistaken for a missing post."""
+        publish._remember_post_id("blog_id", "My Post", "42")
+        error = self._http_error(500)
+        self.mock_posts.get.return_value.execute.side_effect = error
+
+        with self.assertRaises(Exception) as cm:
+            publish._find_cached_post(self.mock_service, "blog_id", "My Post")
+
+        self.assertIs(cm.exception, error)
+
+    def test_publish_post_skips_unchanged_draft(self) -> None:
+        """Test re-publishing a draft's stored content makes no write."""
+        self.mock_iter.return_value = [
+            {"id": "123", "title": "Existing Post", "status": "DRAFT"}
+        ]
+        self.mock_posts.get.return_value.execute.return_value = {
+            "id": "123",
+            "title": "Existing Post",
+            "status": "DRAFT",
+            "content": "<p>Same</p>",
+            "labels": ["b", "a"],
+        }
+
+        result = publish_post(
+            *self.CREDS,
+            "Existing Post",
+            "<p>Same</p>",
+            labels=["a", "b"],
+        )
+
+        self.assertEqual(result["id"], "123")
+        self.mock_posts.update.assert_not_called()
+
+    def test_publish_posts_batches_writes(self) -> None:
+        """Test several posts are written in one batch after one scan."""
+        self.mock_service.new_batch_http_request.side_effect = _FakeBatch
+        self.mock_posts.update.return_value.execute.return_value = {
+            "id": "123"
+        }
+        self.mock_iter.return_value = [
+            {"id": "123", "title": "Draft Post", "status": "DRAFT"},
+            {"id": "456", "title": "Live Post", "status": "LIVE"},
+        ]
+
+        results = publish_posts(
+            *self.CREDS,
+            [
+                {"title": "New Post", "content": "One"},
+                {"title": "Draft Post", "content": "Two"},
+                {"title": "Live Post", "content": "Three"},
+            ],
         )
 
-    @patch("blogger.publish.get_service")
-    def test_publish_post_auth_failure(
-        self, mock_get_service: MagicMock
+        self.assertEqual([r["id"] for r in results], ["999", "123", "456"])
+        self.mock_iter.assert_called_once()
+        self.mock_service.new_batch_http_request.assert_called_once()
+        self.mock_posts.insert.assert_called_once()
+        self.mock_posts.update.assert_called_once()
+
+    def test_publish_posts_records_writes_before_a_failure(self) -> None:
+        """Test a failed write does not lose the writes that succeeded."""
+        self.mock_service.new_batch_http_request.side_effect = _FakeBatch
+        self.mock_posts.update.return_value.execute.return_value = {"id": "A"}
+        error = self._http_error(500)
+        failures = [error]
+
+        def insert(blogId: str, body: dict[str, Any], isDraft: bool) -> Mock:
+            req = Mock()
+            if body["title"] == "B" and failures:
+                req.execute.side_effect = failures.pop()
+            else:
+                req.execute.return_value = {
+                    "id": body["title"],
+                    "title": body["title"],
+                    "status": "DRAFT",
+                }
+            return req
+
+        self.mock_posts.insert.side_effect = insert
+        posts = [
+            {"title": "A", "content": "One"},
+            {"title": "B", "content": "Two"},
+        ]
+
+        with self.assertRaises(Exception) as cm:
+            publish_posts(*self.CREDS, posts)
+        self.assertIs(cm.exception, error)
+        results = publish_posts(*self.CREDS, posts)
+
+        inserted = [
+            kwargs["body"]["title"]
+            for _, kwargs in self.mock_posts.insert.call_args_list
+        ]
+        self.assertEqual(inserted, ["A", "B", "B"])
+        self.assertEqual([r["id"] for r in results], ["A", "B"])
+        self.assertEqual(
+            publish._load_post_ids("blog_id"), {"a": "A", "b": "B"}
+        )
+
+    def test_publish_posts_records_writes_before_a_transport_error(
+        self,
     ) -> None:
+        """Test a failed later batch keeps the writes of earlier batches."""
+        error = ConnectionError("Connection reset")
+        batches: list[_FakeBatch] = []
+
+        def new_batch(callback: Any) -> _FakeBatch:
+            batch = _FakeBatch(callback)
+            if batches:
+                batch.execute = Mock(side_effect=error)  # type: ignore
+            batches.append(batch)
+            return batch
+
+        self.mock_service.new_batch_http_request.side_effect = new_batch
+        posts = [
+            {"title": "A", "content": "One"},
+            {"title": "B", "content": "Two"},
+        ]
+
+        with (
+            patch("blogger.publish._BATCH_LIMIT", 1),
+            self.assertRaises(ConnectionError) as cm,
+        ):
+            publish_posts(*self.CREDS, posts)
+
+        self.assertIs(cm.exception, error)
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(publish._load_post_ids("blog_id"), {"a": "999"})
+
+    def test_publish_posts_rejects_duplicate_titles(self) -> None:
+        """Test titles matching after normalising are refused up front."""
+        posts = [
+            {"title": "My Post", "content": "One"},
+            {"title": " my post ", "content": "Two"},
+        ]
+
+        with self.assertRaises(ValueError):
+            publish_posts(*self.CREDS, posts)
+
+        self.mock_get_service.assert_not_called()
+        self.mock_posts.insert.assert_not_called()
+
+    def test_publish_post_auth_failure(self) -> None:
         """Test that auth errors are propagated."""
-        mock_get_service.side_effect = google.auth.exceptions.RefreshError(
-            "Invalid token"
-        )
-
-        with self.assertRaises(google.auth.exceptions.RefreshError):
-            publish_post(
-                "client_id",
-                "client_secret",
-                "refresh_token",
-                "blog_id",
-                "Test Post",
-                "Content",
-            )
+        from google.auth.exceptions import RefreshError  # type: ignore
+
+        self.mock_get_service.side_effect = RefreshError("Invalid token")
 
-    @patch("blogger.publish._iter_posts")
-    def test_find_post_by_title_scheduled(
-        self, mock_iterate: MagicMock
+        with self.assertRaises(RefreshError):
+            publish_post(*self.CREDS, "Test Post", "Content")
+
+    @patch("google.oauth2.credentials.Credentials")
+    @patch("googleapiclient.discovery.build")
+    def test_get_service_is_cached(
+        self, mock_build: MagicMock, mock_credentials: MagicMock
     ) -> None:
+        """Test the service is built once per credential set."""
+        mock_credentials.return_value.valid = True
+        publish._build_service.cache_clear()
+        self.addCleanup(publish._build_service.cache_clear)
+        self.addCleanup(publish._creds_cache.clear)
+
+        first = get_service("client_id", "client_secret", "refresh_token")
+        second = get_service("client_id", "client_secret", "refresh_token")
+
+        self.assertIs(first, second)
+        mock_build.assert_called_once()
+        _, kwargs = mock_build.call_args
+        self.assertTrue(kwargs["static_discovery"])
+        self.assertIsNotNone(kwargs["http"].http.cache)
+        mock_credentials.assert_called_once()
+        mock_credentials.return_value.refresh.assert_not_called()
+        self.assertNotIn("refresh_token", publish._creds_cache)
+
+    def test_http_cache_round_trips_and_prunes(self) -> None:
+        """Test the HTTP cache stores entries and drops stale ones."""
+        from httplib2 import safename  # type: ignore
+
+        with TemporaryDirectory() as tmp_dir:
+            cache = publish._HttpCache(Path(tmp_dir))
+            cache.set("https://example.com/a", b"fresh")
+            cache.set("https://example.com/b", b"stale")
+            stale = Path(tmp_dir) / safename("https://example.com/b")
+            os.utime(stale, (0, 0))
+
+            cache = publish._HttpCache(Path(tmp_dir))
+
+            self.assertEqual(cache.get("https://example.com/a"), b"fresh")
+            self.assertIsNone(cache.get("https://example.com/b"))
+
+    def test_http_cache_tolerates_unwritable_dir(self) -> None:
+        """Test a cache directory that cannot be created disables caching."""
+        cache = publish._HttpCache(Path("/dev/null/cache"))
+
+        cache.set("https://example.com/a", b"body")
+        self.assertIsNone(cache.get("https://example.com/a"))
+        cache.delete("https://example.com/a")
+
+    def test_token_request_returns_final_response(self) -> None:
+        """Test exhausted token retries return the response, not raise."""
+        session = publish._token_request().session
+        adapter = session.get_adapter("https://oauth2.googleapis.com/token")
+
+        self.assertFalse(adapter.max_retries.raise_on_status)
+
+    @patch("google.oauth2.credentials.Credentials")
+    @patch("googleapiclient.discovery.build")
+    def test_get_service_is_per_thread(
+        self, mock_build: MagicMock, mock_credentials: MagicMock
+    ) -> None:
+        """Test threads never share a service or its HTTP connection."""
+        mock_credentials.return_value.valid = True
+        mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+        publish._build_service.cache_clear()
+        self.addCleanup(publish._build_service.cache_clear)
+        self.addCleanup(publish._creds_cache.clear)
+
+        here = get_service("client_id", "client_secret", "refresh_token")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            there = pool.submit(
+                get_service, "client_id", "client_secret", "refresh_token"
+            ).result()
+
+        self.assertIsNot(here, there)
+        mock_credentials.assert_called_once()
+
+    @unittest.skipIf(publish.orjson is None, "orjson is not installed")
+    def test_orjson_model_deserializes_responses(self) -> None:
+        """Test API responses decode with orjson, falling back on bad JSON."""
+        model = publish._response_model()
+
+        self.assertEqual(
+            model.deserialize(b'{"items": [{"id": "1"}]}'),
+            {"items": [{"id": "1"}]},
+        )
+        self.assertEqual(model.deserialize(b"not json"), "not json")
+
+    def test_find_post_by_title_reuses_full_scan(self) -> None:
+        """Test a scan that finds nothing answers later lookups offline."""
+        self.mock_iter.return_value = [
+            {"id": "123", "title": "Other Post", "status": "DRAFT"}
+        ]
+
+        self.assertIsNone(
+            find_post_by_title(self.mock_service, "blog_id", "My Post")
+        )
+        self.mock_iter.reset_mock()
+        self.mock_posts.reset_mock()
+        result = find_post_by_title(self.mock_service, "blog_id", "Other Post")
+
+        self.assertEqual(result["id"], "123")  # type: ignore
+        self.mock_iter.assert_not_called()
+        self.mock_posts.search.assert_not_called()
+
+    def test_find_post_by_title_scheduled(self) -> None:
         """Test scheduled posts are found by title."""
-        mock_iterate.return_value = [
+        self.mock_iter.return_value = [
             {"id": "123", "title": "My Post", "status": "SCHEDULED"},
         ]
 
@@ -164,40 +600,29 @@ class TestPublish(unittest.TestCase):
         self.assertEqual(result["id"], "123")  # type: ignore
         self.assertEqual(result["status"], "SCHEDULED")  # type: ignore
 
-    @patch("blogger.publish._iter_posts")
-    def test_find_post_by_title_missing_status(
-        self, mock_iterate: MagicMock
-    ) -> None:
+    def test_find_post_by_title_missing_status(self) -> None:
         """Test missing status does not raise during logging."""
-        mock_iterate.return_value = [
+        self.mock_iter.return_value = [
             {"id": "123", "title": "My Post"},
         ]
 
-        with self.assertLogs("blogger.publish", level="INFO") as cm:
-            result = find_post_by_title(
-                self.mock_service, "blog_id", "My Post"
-            )
+        result = find_post_by_title(self.mock_service, "blog_id", "My Post")
 
         self.assertIsNotNone(result)
         self.assertEqual(result["id"], "123")  # type: ignore
         self.assertTrue(
-            any("Status:UNKNOWN" in output for output in cm.output)
+            any("Status:UNKNOWN" in m for m in self._handler.records)
         )
 
-    @patch("blogger.publish._iter_posts")
-    def test_find_post_by_title_http_error(
-        self, mock_iterate: MagicMock
-    ) -> None:
+    def test_find_post_by_title_http_error(self) -> None:
         """Test that HTTP errors are propagated."""
-        from googleapiclient.errors import HttpError
-
-        mock_iterate.side_effect = HttpError(
-            MagicMock(status=400), b"Bad Request"
-        )
+        self.mock_iter.side_effect = self._http_err
 
-        with self.assertRaises(HttpError):
+        with self.assertRaises(Exception) as cm:
             find_post_by_title(self.mock_service, "blog_id", "Test")
 
+        self.assertIs(cm.exception, self._http_err)
+
     def test_encode_image_outputs_jpeg(self) -> None:
         """Ensure images are encoded as JPEG data URIs."""
         with TemporaryDirectory() as tmp_dir:
@@ -213,28 +638,178 @@ class TestPublish(unittest.TestCase):
             raw = base64.b64decode(payload)
             self.assertTrue(raw.startswith(b"\xff\xd8\xff"))
 
-    @patch("blogger.publish.get_service")
-    @patch("blogger.publish._iter_posts")
-    def test_publish_post_removes_style_tags(
-        self, mock_iterate: MagicMock, mock_get_service: MagicMock
+    @patch(
+        "blogger.publish._resize_image_if_needed",
+        wraps=_resize_image_if_needed,
+    )
+    def test_encode_image_reuses_cached_jpeg(
+        self, mock_resize: MagicMock
     ) -> None:
-        """Ensure style blocks are stripped before creating a post."""
-        mock_get_service.return_value = self.mock_service
-        mock_iterate.return_value = []
+        """Ensure an unchanged image is only resized once."""
+        with TemporaryDirectory() as tmp_dir:
+            img_path = Path(tmp_dir) / "input.png"
+            Image.new("RGB", (16, 16)).save(img_path)
+
+            first = _encode_image(img_path)
+            second = _encode_image(img_path)
+            _jpeg_bytes.cache_clear()  # force a read from the disk cache
+            third = _encode_image(img_path)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        mock_resize.assert_called_once()
+
+    def test_encode_image_cache_keys_on_backend_and_prunes(self) -> None:
+        """Ensure cached JPEGs are per backend and stale ones are dropped."""
+        stale = publish._cache_dir() / "img" / "stale.jpg"
+        stale.parent.mkdir(parents=True)
+        stale.write_bytes(b"old")
+        os.utime(stale, (0, 0))
+        with TemporaryDirectory() as tmp_dir:
+            img_path = Path(tmp_dir) / "input.png"
+            Image.new("RGB", (16, 16)).save(img_path)
+
+            for vips in (publish.pyvips, None):
+                _jpeg_bytes.cache_clear()
+                with patch("blogger.publish.pyvips", vips):
+                    _encode_image(img_path)
+
+        cached = list(stale.parent.iterdir())
+        self.assertNotIn(stale, cached)
+        self.assertEqual(len(cached), 2)
+
+    def test_encode_image_resizes_large_jpeg(self) -> None:
+        """Ensure wide JPEGs are scaled down with libvips and Pillow."""
+        for vips in {publish.pyvips, None}:
+            with (
+                self.subTest(vips=vips),
+                patch("blogger.publish.pyvips", vips),
+                TemporaryDirectory() as tmp_dir,
+            ):
+                img_path = Path(tmp_dir) / "wide.jpg"
+                Image.new("RGB", (4000, 2000), (255, 0, 0)).save(img_path)
+
+                uri = _encode_image(img_path)
+
+                raw = base64.b64decode(uri.split(",", 1)[1])  # type: ignore
+                with Image.open(io.BytesIO(raw)) as image:
+                    self.assertEqual(image.size, (1600, 800))
+
+    def test_encode_image_converts_cmyk_to_rgb(self) -> None:
+        """Ensure CMYK JPEGs are saved as RGB by libvips and Pillow."""
+        for vips in {publish.pyvips, None}:
+            with (
+                self.subTest(vips=vips),
+                patch("blogger.publish.pyvips", vips),
+                TemporaryDirectory() as tmp_dir,
+            ):
+                img_path = Path(tmp_dir) / "print.jpg"
+                Image.new("CMYK", (16, 16), (0, 100, 0, 0)).save(img_path)
+
+                uri = _encode_image(img_path)
+
+                raw = base64.b64decode(uri.split(",", 1)[1])  # type: ignore
+                with Image.open(io.BytesIO(raw)) as image:
+                    self.assertEqual(image.mode, "RGB")
+
+    def test_encode_image_keeps_colour_under_alpha(self) -> None:
+        """Ensure both backends drop alpha the same way, not onto black."""
+        for vips in {publish.pyvips, None}:
+            with (
+                self.subTest(vips=vips),
+                patch("blogger.publish.pyvips", vips),
+                TemporaryDirectory() as tmp_dir,
+            ):
+                img_path = Path(tmp_dir) / "logo.png"
+                Image.new("RGBA", (8, 8), (255, 255, 255, 0)).save(img_path)
+
+                uri = _encode_image(img_path)
+
+                raw = base64.b64decode(uri.split(",", 1)[1])  # type: ignore
+                with Image.open(io.BytesIO(raw)) as image:
+                    self.assertEqual(image.getpixel((4, 4)), (255, 255, 255))
+
+    def test_encode_image_rejects_vector_formats(self) -> None:
+        """Ensure an SVG is skipped by both backends, not rasterised."""
+        for vips in {publish.pyvips, None}:
+            with (
+                self.subTest(vips=vips),
+                patch("blogger.publish.pyvips", vips),
+                TemporaryDirectory() as tmp_dir,
+            ):
+                img_path = Path(tmp_dir) / "diagram.svg"
+                img_path.write_text(
+                    '<svg xmlns="http://www.w3.org/2000/svg" width="8" '
+                    'height="8"><rect width="8" height="8"/></svg>'
+                )
+
+                self.assertIsNone(_encode_image(img_path))
+
+    def test_embed_images_keeps_fragment(self) -> None:
+        """Ensure fragments pass through with headers removed."""
+        html = "<header>Nav</header><p>One &amp; two</p>\n<p>Three</p>"
+
+        self.assertEqual(
+            _embed_images(html, None), "<p>One &amp; two</p>\n<p>Three</p>"
+        )
+
+    def test_embed_images_keeps_leading_script_and_comment(self) -> None:
+        """Ensure nodes lxml would move out of a body stay in fragments."""
+        self.assertEqual(
+            _embed_images(
+                "<script>s()</script><p>Hi</p><style>x</style>", None
+            ),
+            "<script>s()</script><p>Hi</p>",
+        )
+        self.assertEqual(
+            _embed_images("<!--more--><p>Rest</p><header>x</header>", None),
+            "<!--more--><p>Rest</p>",
+        )
+
+    @patch("blogger.publish.lxml.html.fragment_fromstring")
+    def test_embed_images_skips_parse_without_local_images(
+        self, mock_parse: MagicMock
+    ) -> None:
+        """Ensure fragments without images or stripped tags are as-is."""
+        html = '<p>Hi <a href="https://example.com/">there</a></p>'
+
+        self.assertEqual(_embed_images(html, None), html)
+        mock_parse.assert_not_called()
+
+    def test_embed_images_encodes_image_after_quoted_bracket(self) -> None:
+        """Ensure a '>' inside an earlier attribute does not hide an image."""
+        with TemporaryDirectory() as tmp_dir:
+            Image.new("RGB", (8, 8)).save(Path(tmp_dir) / "a.png")
+
+            result = _embed_images(
+                '<img alt="a>b" src="a.png">', Path(tmp_dir)
+            )
 
+        self.assertIn('src="data:image/jpeg;base64,', result)
+
+    def test_embed_images_encodes_local_images(self) -> None:
+        """Ensure every local image is embedded and remote ones are kept."""
+        with TemporaryDirectory() as tmp_dir:
+            for name in ("a.png", "b.png"):
+                Image.new("RGB", (8, 8)).save(Path(tmp_dir) / name)
+            html = (
+                '<img src="a.png"><img src="http://example.com/c.png">'
+                '<img src="b.png">'
+            )
+
+            result = _embed_images(html, Path(tmp_dir))
+
+        self.assertEqual(result.count('src="data:image/jpeg;base64,'), 2)
+        self.assertIn('src="http://example.com/c.png"', result)
+
+    def test_publish_post_removes_style_tags(self) -> None:
+        """Ensure style blocks are stripped before creating a post."""
         html = (
             "<html><head><style>.x{color:red;}</style></head>"
             "<body><p>Hello</p></body></html>"
         )
 
-        publish_post(
-            "client_id",
-            "client_secret",
-            "refresh_token",
-            "blog_id",
-            "Styled Post",
-            html,
-        )
+        publish_post(*self.CREDS, "Styled Post", html)
 
         _, kwargs = self.mock_posts.insert.call_args
         self.assertEqual(kwargs["body"]["content"], "<p>Hello</p>")
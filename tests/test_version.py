@@ -1,9 +1,18 @@
 """Test version information."""
 
-import blogger  # type: ignore
+from functools import lru_cache
+from types import ModuleType
+
+
+@lru_cache(maxsize=1)
+def _pkg() -> ModuleType:
+    """Import the package on first use, once per interpreter."""
+    import blogger  # type: ignore
+
+    return blogger
 
 
 def test_version():
     """Test that version is defined."""
-    assert hasattr(blogger, "__version__")
-    assert blogger.__version__ == "1.4"
+    assert hasattr(_pkg(), "__version__")
+    assert _pkg().__version__ == "1.4"